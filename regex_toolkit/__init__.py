@@ -1 +1,23 @@
-from .base import RegexToolkit
+from .base import (
+    RegexToolkit,
+    iter_sort_by_len,
+    sort_by_len,
+    ord_to_codepoint,
+    codepoint_to_ord,
+    ords_to_codepoints,
+    codepoints_to_ords,
+    char_to_codepoint,
+    char_as_exp,
+    char_as_exp2,
+    string_as_exp,
+    string_as_exp2,
+    strings_as_exp,
+    strings_as_exp2,
+    iter_char_range,
+    char_range,
+    char_range_array,
+    mask_span,
+    mask_spans,
+    mask_spans_arrays,
+    to_utf8,
+)
@@ -0,0 +1,156 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Compiled Expression Builders
+
+Drop-in replacements for RegexToolkit.string_as_exp and RegexToolkit.string_as_exp2,
+used automatically when the extension is built.
+"""
+
+import string
+
+from libc.stdio cimport sprintf
+from libc.stdlib cimport free, malloc
+
+
+cdef extern from "Python.h":
+    int PyUnicode_4BYTE_KIND
+    object PyUnicode_FromKindAndData(int kind, const void *buffer, Py_ssize_t size)
+
+
+cdef enum:
+    # Escape using the codepoint (zero so unlisted characters default to it)
+    CODEPOINT = 0
+    # Safe as-is
+    SAFE = 1
+    # Safe to escape with backslash
+    ESCAPABLE = 2
+
+# Length of a codepoint escape (i.e. \x{0001f170})
+cdef Py_ssize_t CODEPOINT_EXP_LEN = 12
+
+# Kind of each ASCII character (mirrors the character sets in regex_toolkit.base)
+cdef unsigned char _kinds[128]
+
+for _char in string.ascii_letters + string.digits + string.whitespace:
+    _kinds[ord(_char)] = SAFE
+
+for _char in string.punctuation:
+    _kinds[ord(_char)] = ESCAPABLE
+
+
+# Expressions of each ASCII character for str.translate (mirrors the tables in regex_toolkit.base)
+_ASCII_EXPS_TRANS = str.maketrans(
+    {chr(_ord): chr(_ord) if _kinds[_ord] == SAFE else f"\\{chr(_ord)}" for _ord in range(128)}
+)
+_ASCII_EXPS2_TRANS = str.maketrans(
+    {
+        chr(_ord): chr(_ord)
+        if _kinds[_ord] == SAFE
+        else f"\\{chr(_ord)}"
+        if _kinds[_ord] == ESCAPABLE
+        else f"\\x{{{_ord:08x}}}"
+        for _ord in range(128)
+    }
+)
+
+
+cdef inline bint _is_safe(Py_UCS4 ch):
+    return ch < 128 and _kinds[ch] == SAFE
+
+
+def string_as_exp(str text not None):
+    """Create a re Regex Expression that Exactly Matches a String
+
+    Args:
+        text (str): String to match.
+
+    Returns:
+        str: re expression that exactly matches the original string.
+    """
+    cdef Py_UCS4 ch
+    cdef Py_ssize_t size = 0
+    cdef Py_ssize_t i = 0
+    cdef Py_UCS4 *buf
+
+    # ASCII is faster through the translation table than the loop below
+    if text.isascii():
+        return text.translate(_ASCII_EXPS_TRANS)
+
+    # Size the expression up front so it is built in a single allocation
+    for ch in text:
+        size += 1 if _is_safe(ch) else 2
+
+    if size == 0:
+        return ""
+
+    buf = <Py_UCS4 *>malloc(size * sizeof(Py_UCS4))
+    if buf == NULL:
+        raise MemoryError()
+
+    try:
+        for ch in text:
+            if not _is_safe(ch):
+                buf[i] = u"\\"
+                i += 1
+
+            buf[i] = ch
+            i += 1
+
+        return PyUnicode_FromKindAndData(PyUnicode_4BYTE_KIND, buf, size)
+    finally:
+        free(buf)
+
+
+def string_as_exp2(str text not None):
+    """Create a re2 Regex Expression that Exactly Matches a String
+
+    Args:
+        text (str): String to match.
+
+    Returns:
+        str: re2 expression that exactly matches the original string.
+    """
+    cdef Py_UCS4 ch
+    cdef unsigned char kind
+    cdef Py_ssize_t size = 0
+    cdef Py_ssize_t i = 0
+    cdef char *buf
+
+    # ASCII is faster through the translation table than the loop below
+    if text.isascii():
+        return text.translate(_ASCII_EXPS2_TRANS)
+
+    # Size the expression up front so it is built in a single allocation
+    for ch in text:
+        kind = _kinds[ch] if ch < 128 else CODEPOINT
+        if kind == SAFE:
+            size += 1
+        elif kind == ESCAPABLE:
+            size += 2
+        else:
+            size += CODEPOINT_EXP_LEN
+
+    if size == 0:
+        return ""
+
+    # The expression is always ASCII (plus room for the terminator written by sprintf)
+    buf = <char *>malloc(size + 1)
+    if buf == NULL:
+        raise MemoryError()
+
+    try:
+        for ch in text:
+            kind = _kinds[ch] if ch < 128 else CODEPOINT
+            if kind == SAFE:
+                buf[i] = <char>ch
+                i += 1
+            elif kind == ESCAPABLE:
+                buf[i] = b"\\"
+                buf[i + 1] = <char>ch
+                i += 2
+            else:
+                sprintf(buf + i, b"\\x{%08x}", <unsigned int>ch)
+                i += CODEPOINT_EXP_LEN
+
+        return buf[:size].decode("ascii")
+    finally:
+        free(buf)
@@ -1,271 +1,618 @@
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Sequence
+from functools import lru_cache
+from operator import itemgetter
+
+from typing import TYPE_CHECKING
 
 import string
 
+if TYPE_CHECKING:
+    import numpy
 
-class RegexToolkit:
-    _alpha_chars: set[str] = set(string.ascii_letters)
-    _digit_chars: set[str] = set(string.digits)
-
-    _safe_chars: set[str] = _alpha_chars.union(_digit_chars).union(set(string.whitespace))
-    _escapable_chars: set[str] = set(string.punctuation)
-
-    @staticmethod
-    def iter_sort_by_len(
-        texts: Iterable[str],
-        *,
-        reverse: bool = True,
-    ) -> Iterable[str]:
-        """Iterate Texts Sorted by Length
-
-        Args:
-            texts (Iterable[str]): Strings to sort.
-            reverse (bool, optional): Sort in descending order (longest to shortest). Defaults to True.
-
-        Yields:
-            str: Strings sorted by length.
-        """
-        for text in sorted(texts, key=len, reverse=reverse):
-            yield text
-
-    @staticmethod
-    def sort_by_len(
-        texts: Iterable[str],
-        *,
-        reverse: bool = True,
-    ) -> tuple[str, ...]:
-        """Strings Sorted by Length
-
-        Args:
-            texts (Iterable[str]): Strings to sort.
-            reverse (bool, optional): Sort in descending order (longest to shortest). Defaults to True.
-
-        Returns:
-            tuple[str]: Strings sorted by length.
-        """
-        return tuple(RegexToolkit.iter_sort_by_len(texts, reverse=reverse))
-
-    @staticmethod
-    def ord_to_codepoint(ordinal: int) -> str:
-        """Character Codepoint from Character Ordinal
-
-        Args:
-            ordinal (int): Character ordinal.
-
-        Returns:
-            str: Character codepoint.
-        """
-        return format(ordinal, "x").zfill(8)
-
-    @staticmethod
-    def codepoint_to_ord(codepoint: str) -> int:
-        """Character Ordinal from Character Codepoint
-
-        Args:
-            codepoint (str): Character codepoint.
-
-        Returns:
-            int: Character ordinal.
-        """
-        return int(codepoint, 16)
-
-    @staticmethod
-    def char_to_codepoint(char: str) -> str:
-        """Character Codepoint from Character
-
-        Args:
-            char (str): Character.
-
-        Returns:
-            str: Character codepoint.
-        """
-        return RegexToolkit.ord_to_codepoint(ord(char))
-
-    @staticmethod
-    def char_as_exp(char: str) -> str:
-        """Create a re Regex Expression that Exactly Matches a Character
-
-        Escape to avoid reserved character classes (i.e. \s, \S, \d, \D, \1, etc.).
-
-        Args:
-            char (str): Character to match.
-
-        Returns:
-            str: re expression that exactly matches the original character.
-        """
-        # Safe as-is
-        if char in RegexToolkit._safe_chars:
-            return char
-
-        # Escape with backslash
-        return f"\\{char}"
-
-    @staticmethod
-    def char_as_exp2(char: str) -> str:
-        """Create a re2 Regex Expression that Exactly Matches a Character
-
-        Args:
-            char (str): Character to match.
-
-        Returns:
-            str: re2 expression that exactly matches the original character.
-        """
-        # Safe as-is
-        if char in RegexToolkit._safe_chars:
-            return char
-
-        # Safe to escape with backslash
-        if char in RegexToolkit._escapable_chars:
-            return f"\\{char}"
-
-        # Otherwise escape using the codepoint
-        return "\\x{" + RegexToolkit.char_to_codepoint(char) + "}"
-
-    @staticmethod
-    def string_as_exp(text: str) -> str:
-        """Create a re Regex Expression that Exactly Matches a String
-
-        Args:
-            text (str): String to match.
-
-        Returns:
-            str: re expression that exactly matches the original string.
-        """
-        return r"".join(map(RegexToolkit.char_as_exp, text))
-
-    @staticmethod
-    def string_as_exp2(text: str) -> str:
-        """Create a re2 Regex Expression that Exactly Matches a String
-
-        Args:
-            text (str): String to match.
-
-        Returns:
-            str: re2 expression that exactly matches the original string.
-        """
-        return r"".join(map(RegexToolkit.char_as_exp2, text))
-
-    @staticmethod
-    def strings_as_exp(texts: Iterable[str]) -> str:
-        """Create a re Regex expression that Exactly Matches Any One String
-
-        Args:
-            texts (Iterable[str]): Strings to match.
-
-        Returns:
-            str: re expression that exactly matches any one of the original strings.
-        """
-        return r"|".join(
-            map(
-                RegexToolkit.string_as_exp,
-                RegexToolkit.iter_sort_by_len(texts, reverse=True),
-            )
-        )
-
-    @staticmethod
-    def strings_as_exp2(texts: Iterable[str]) -> str:
-        """Create a re2 Regex expression that Exactly Matches Any One String
-
-        Args:
-            texts (Iterable[str]): Strings to match.
-
-        Returns:
-            str: re2 expression that exactly matches any one of the original strings.
-        """
-        return r"|".join(
-            map(
-                RegexToolkit.string_as_exp2,
-                RegexToolkit.iter_sort_by_len(texts, reverse=True),
-            )
-        )
-
-    @staticmethod
-    def iter_char_range(first_codepoint: int, last_codepoint: int) -> Iterable[str]:
-        """Iterate All Characters within a Range of Codepoints (Inclusive)
-
-        Args:
-            first_codepoint (int): Starting (first) codepoint.
-            last_codepoint (int): Ending (last) codepoint.
-
-        Yields:
-            str: Character from within a range of codepoints.
-        """
-        for i in range(ord(first_codepoint), ord(last_codepoint) + 1):
-            yield chr(i)
-
-    @staticmethod
-    def char_range(first_codepoint: int, last_codepoint: int) -> tuple[str, ...]:
-        """Tuple of All Characters within a Range of Codepoints (Inclusive)
-
-        Args:
-            first_codepoint (int): Starting (first) codepoint.
-            last_codepoint (int): Ending (last) codepoint.
-
-        Returns:
-            tuple[str, ...]: Characters within a range of codepoints.
-        """
-        return tuple(RegexToolkit.iter_char_range(first_codepoint, last_codepoint))
-
-    @staticmethod
-    def mask_span(
-        text: str,
-        span: list[int] | tuple[int, int],
-        mask: str | None = None,
-    ) -> str:
-        """Slice and Mask a String using a Span
-
-        Args:
-            text (str): Text to slice.
-            span (list[int] | tuple[int, int]): Domain of index positions (x1, x2) to mask from the text.
-            mask (str, optional): Mask to insert when slicing. Defaults to None.
-
-        Returns:
-            str: Text with span replaced with the mask text.
-        """
-        # if mask is None:
-        #     mask = ""
-        #
-        # return text[: span[0]] + mask + text[span[1] :]
-        if mask is None:
-            return text[: span[0]] + text[span[1] :]
-        else:
-            return text[: span[0]] + mask + text[span[1] :]
-
-    @staticmethod
-    def mask_spans(
-        text: str,
-        spans: Iterable[list[int] | tuple[int, int]],
-        masks: Iterable[str] | None = None,
-    ) -> str:
-        """Slice and Mask a String using Multiple Spans
-
-        Args:
-            text (str): Text to slice.
-            spans (Iterable[list[int] | tuple[int, int]]): Domains of index positions (x1, x2) to mask from the text.
-            masks (Iterable[str], optional): Masks to insert when slicing. Defaults to None.
-
-        Returns:
-            str: Text with all spans replaced with the mask text.
-        """
-        if masks is None:
-            # No masks
-            for span in reversed(spans):
-                text = RegexToolkit.mask_span(text, span, mask=None)
+_ALPHA_CHARS: frozenset[str] = frozenset(string.ascii_letters)
+_DIGIT_CHARS: frozenset[str] = frozenset(string.digits)
+
+_SAFE_CHARS: frozenset[str] = _ALPHA_CHARS.union(_DIGIT_CHARS, string.whitespace)
+_ESCAPABLE_CHARS: frozenset[str] = frozenset(string.punctuation)
+
+# Expressions for every ASCII character, precomputed so escaping one is a single lookup
+_ASCII_CHARS: tuple[str, ...] = tuple(map(chr, range(128)))
+_CHAR_EXPS: dict[str, str] = {char: char if char in _SAFE_CHARS else f"\\{char}" for char in _ASCII_CHARS}
+_CHAR_EXPS2: dict[str, str] = {
+    char: (char if char in _SAFE_CHARS else f"\\{char}" if char in _ESCAPABLE_CHARS else f"\\x{{{ord(char):08x}}}")
+    for char in _ASCII_CHARS
+}
+_CHAR_EXPS_TRANS: dict[int, str] = str.maketrans(_CHAR_EXPS)
+_CHAR_EXPS2_TRANS: dict[int, str] = str.maketrans(_CHAR_EXPS2)
+
+
+class _CodepointExps(dict):
+    # Translation table that escapes any character missing from it (i.e. non-ASCII) using the codepoint,
+    # so a single str.translate pass covers every character (not cached, to keep the table small)
+    __slots__ = ()
+
+    def __missing__(self, ordinal: int) -> str:
+        return f"\\x{{{ordinal:08x}}}"
+
+
+_ALL_CHAR_EXPS2_TRANS: dict[int, str] = _CodepointExps(_CHAR_EXPS2_TRANS)
+
+# Hex digits of a codepoint, and the value of each ASCII hex digit (0xFF if invalid)
+_HEX_DIGITS: bytes = b"0123456789abcdef"
+_HEX_VALUES: bytes = bytes(int(char, 16) if char in string.hexdigits else 0xFF for char in map(chr, range(256)))
+# Shift of each hex digit in a codepoint (most significant first)
+_CODEPOINT_SHIFTS: tuple[int, ...] = tuple(range(28, -1, -4))
+
+
+def _build_trie(texts: Iterable[str]) -> dict:
+    # Characters map to child nodes, with None marking the end of a string
+    trie = {}
+    for text in texts:
+        node = trie
+        for char in text:
+            child = node.get(char)
+            if child is None:
+                child = node[char] = {}
+
+            node = child
+
+        node[None] = None
+
+    return trie
+
+
+def _trie_as_exp(trie: dict, text_as_exp: Callable[[str], str]) -> str:
+    # Walk depth first without recursion, since prefixes can be nested arbitrarily deep
+    # Each frame holds the expression leading to a node, whether a string ends there,
+    # the node's remaining children, its finished branches, and the parent's branches
+    root_branches = []
+    stack = [("", None in trie, iter(trie.items()), root_branches, None)]
+    while stack:
+        prefix_exp, optional, children, branches, parent_branches = stack[-1]
+        for char, child in children:
+            if char is None:
+                continue
+
+            # Collapse chains of single children into one literal run
+            run = [char]
+            while len(child) == 1 and None not in child:
+                ((char, child),) = child.items()
+                run.append(char)
+
+            stack.append((text_as_exp("".join(run)), None in child, iter(child.items()), [], branches))
+            break
         else:
-            # Has mask
-            for span, mask in zip(reversed(spans), reversed(masks)):
-                text = RegexToolkit.mask_span(text, span, mask=mask)
+            stack.pop()
+            if parent_branches is not None:
+                parent_branches.append(prefix_exp + _branches_as_exp(branches, optional))
+
+    # An empty string matches last, as when sorted by length
+    if None in trie:
+        root_branches.append("")
+
+    return r"|".join(root_branches)
+
+
+def _branches_as_exp(branches: list[str], optional: bool) -> str:
+    if not branches:
+        return ""
+
+    if len(branches) == 1 and not optional:
+        return branches[0]
+
+    return r"(?:" + r"|".join(branches) + (r")?" if optional else r")")
+
+
+# Memoized by strings, since the same strings are often converted repeatedly
+@lru_cache(maxsize=128)
+def _strings_as_exp(texts: tuple[str, ...]) -> str:
+    # A single string has nothing to group, so skip building the trie
+    if len(texts) == 1:
+        return string_as_exp(texts[0])
+
+    return _trie_as_exp(_build_trie(sorted(texts, key=len, reverse=True)), string_as_exp)
+
+
+@lru_cache(maxsize=128)
+def _strings_as_exp2(texts: tuple[str, ...]) -> str:
+    if len(texts) == 1:
+        return string_as_exp2(texts[0])
+
+    return _trie_as_exp(_build_trie(sorted(texts, key=len, reverse=True)), string_as_exp2)
+
+
+def _mask_spans_unmasked(text: str, spans: Iterable[list[int] | tuple[int, int]]) -> str:
+    # Join the text between spans in a single pass instead of re-slicing the text for each span
+    parts = []
+    prev_end = 0
+    for start, end in sorted(spans, key=itemgetter(0)):
+        parts.append(text[prev_end:start])
+        prev_end = end
+
+    parts.append(text[prev_end:])
+    return "".join(parts)
+
+
+def _mask_spans_masked(
+    text: str,
+    spans: Iterable[list[int] | tuple[int, int]],
+    masks: Iterable[str],
+) -> str:
+    # Same as unmasked, with each mask kept with its span when sorting
+    parts = []
+    prev_end = 0
+    for (start, end), mask in sorted(zip(spans, masks), key=lambda pair: pair[0][0]):
+        parts.append(text[prev_end:start])
+        if mask is not None:
+            parts.append(mask)
+
+        prev_end = end
+
+    parts.append(text[prev_end:])
+    return "".join(parts)
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("numpy is required for array functions (pip install regex-toolkit[numpy])") from e
+
+    return numpy
+
+
+def _codepoint_range(first_codepoint: int | str, last_codepoint: int | str) -> range:
+    # Accept characters as well as ordinals
+    if isinstance(first_codepoint, str):
+        first_codepoint = ord(first_codepoint)
+    if isinstance(last_codepoint, str):
+        last_codepoint = ord(last_codepoint)
+
+    return range(first_codepoint, last_codepoint + 1)
+
+
+def iter_sort_by_len(
+    texts: Iterable[str],
+    *,
+    reverse: bool = True,
+) -> Iterable[str]:
+    """Iterate Texts Sorted by Length
+
+    Args:
+        texts (Iterable[str]): Strings to sort.
+        reverse (bool, optional): Sort in descending order (longest to shortest). Defaults to True.
+
+    Returns:
+        Iterable[str]: Strings sorted by length.
+    """
+    return iter(sorted(texts, key=len, reverse=reverse))
+
+
+def sort_by_len(
+    texts: Iterable[str],
+    *,
+    reverse: bool = True,
+) -> tuple[str, ...]:
+    """Strings Sorted by Length
+
+    Args:
+        texts (Iterable[str]): Strings to sort.
+        reverse (bool, optional): Sort in descending order (longest to shortest). Defaults to True.
+
+    Returns:
+        tuple[str]: Strings sorted by length.
+    """
+    return tuple(sorted(texts, key=len, reverse=reverse))
+
+
+def ord_to_codepoint(ordinal: int) -> str:
+    """Character Codepoint from Character Ordinal
+
+    Args:
+        ordinal (int): Character ordinal.
+
+    Returns:
+        str: Character codepoint.
+    """
+    return f"{ordinal:08x}"
+
+
+def codepoint_to_ord(codepoint: str) -> int:
+    """Character Ordinal from Character Codepoint
+
+    Args:
+        codepoint (str): Character codepoint.
+
+    Returns:
+        int: Character ordinal.
+    """
+    return int(codepoint, 16)
+
+
+def ords_to_codepoints(ordinals: "Sequence[int] | numpy.ndarray") -> "numpy.ndarray":
+    """Character Codepoints from Character Ordinals (Vectorized)
+
+    Requires numpy. Converts all ordinals at once instead of calling ord_to_codepoint for each.
+
+    Args:
+        ordinals (Sequence[int] | numpy.ndarray): Character ordinals.
+
+    Returns:
+        numpy.ndarray: Character codepoints (dtype S8).
 
-        return text
+    Raises:
+        ValueError: If an ordinal is not an integer or does not fit in 8 hex digits.
+    """
+    np = _import_numpy()
+    ordinals = np.asarray(ordinals)
+    # Check before casting since other values would be truncated (i.e. floats) or wrap around
+    if ordinals.dtype == object:
+        is_integer = all(isinstance(ordinal, (int, np.integer)) for ordinal in ordinals.flat)
+    else:
+        is_integer = np.issubdtype(ordinals.dtype, np.integer) or ordinals.dtype == np.bool_
+    if ordinals.size and not is_integer:
+        raise ValueError("Ordinals must be integers")
 
-    @staticmethod
-    def to_utf8(text: str) -> str:
-        """Force UTF-8 Text Encoding
+    if ordinals.size and (ordinals.min() < 0 or ordinals.max() > 0xFFFFFFFF):
+        raise ValueError("Ordinals must be between 0 and 0xFFFFFFFF")
 
-        Args:
-            text (str): Text to encode.
+    ordinals = ordinals.astype(np.uint32)
 
-        Returns:
-            str: Encoded text.
-        """
-        return text.encode("utf-8").decode("utf-8")
+    # Split each ordinal into 8 nibbles (most significant first) and look up their hex digits
+    shifts = np.array(_CODEPOINT_SHIFTS, dtype=np.uint32)
+    nibbles = (ordinals[..., np.newaxis] >> shifts) & 0xF
+    digits = np.frombuffer(_HEX_DIGITS, dtype=np.uint8)[nibbles]
+    return digits.view("S8")[..., 0]
+
+
+def codepoints_to_ords(codepoints: "Sequence[str] | numpy.ndarray") -> "numpy.ndarray":
+    """Character Ordinals from Character Codepoints (Vectorized)
+
+    Requires numpy. Converts all codepoints at once instead of calling codepoint_to_ord for each.
+
+    Args:
+        codepoints (Sequence[str] | numpy.ndarray): Character codepoints (8 hex digits each).
+
+    Returns:
+        numpy.ndarray: Character ordinals (dtype uint32).
+
+    Raises:
+        ValueError: If a codepoint is not 8 hex digits.
+    """
+    np = _import_numpy()
+    codepoints = np.asarray(codepoints)
+    # Check before casting since longer codepoints would be truncated
+    if codepoints.size and (np.char.str_len(codepoints) > 8).any():
+        raise ValueError("Codepoints must be 8 hex digits")
+
+    codepoints = codepoints.astype("S8")
+
+    # Look up the value of each hex digit (invalid and missing digits are 0xFF)
+    nibbles = np.ascontiguousarray(codepoints).view(np.uint8).reshape(codepoints.shape + (8,))
+    values = np.frombuffer(_HEX_VALUES, dtype=np.uint8)[nibbles]
+    if (values == 0xFF).any():
+        raise ValueError("Codepoints must be 8 hex digits")
+
+    shifts = np.array(_CODEPOINT_SHIFTS, dtype=np.uint32)
+    return np.bitwise_or.reduce(values.astype(np.uint32) << shifts, axis=-1)
+
+
+def char_to_codepoint(char: str) -> str:
+    """Character Codepoint from Character
+
+    Args:
+        char (str): Character.
+
+    Returns:
+        str: Character codepoint.
+    """
+    return f"{ord(char):08x}"
+
+
+def char_as_exp(char: str) -> str:
+    """Create a re Regex Expression that Exactly Matches a Character
+
+    Escape to avoid reserved character classes (i.e. \s, \S, \d, \D, \1, etc.).
+
+    Args:
+        char (str): Character to match.
+
+    Returns:
+        str: re expression that exactly matches the original character.
+    """
+    # Precomputed for ASCII, otherwise escape with backslash
+    return _CHAR_EXPS.get(char) or f"\\{char}"
+
+
+def char_as_exp2(char: str) -> str:
+    """Create a re2 Regex Expression that Exactly Matches a Character
+
+    Args:
+        char (str): Character to match.
+
+    Returns:
+        str: re2 expression that exactly matches the original character.
+    """
+    # Precomputed for ASCII, otherwise escape using the codepoint
+    return _CHAR_EXPS2.get(char) or f"\\x{{{ord(char):08x}}}"
+
+
+def string_as_exp(text: str) -> str:
+    """Create a re Regex Expression that Exactly Matches a String
+
+    Args:
+        text (str): String to match.
+
+    Returns:
+        str: re expression that exactly matches the original string.
+    """
+    # Translate ASCII in a single pass
+    if text.isascii():
+        return text.translate(_CHAR_EXPS_TRANS)
+
+    # Otherwise look up each character, escaping non-ASCII with backslash
+    exps = _CHAR_EXPS
+    return r"".join([exps.get(char) or f"\\{char}" for char in text])
+
+
+def string_as_exp2(text: str) -> str:
+    """Create a re2 Regex Expression that Exactly Matches a String
+
+    Args:
+        text (str): String to match.
+
+    Returns:
+        str: re2 expression that exactly matches the original string.
+    """
+    # Translate in a single pass, using the plain table for ASCII since its lookups are faster
+    if text.isascii():
+        return text.translate(_CHAR_EXPS2_TRANS)
+
+    return text.translate(_ALL_CHAR_EXPS2_TRANS)
+
+
+def strings_as_exp(texts: Iterable[str]) -> str:
+    """Create a re Regex expression that Exactly Matches Any One String
+
+    Strings that share a prefix are grouped (i.e. ab|ac becomes a(?:b|c)), trying longer strings first.
+    Grouping compares exact characters, so it assumes case-sensitive matching
+    (with IGNORECASE a shorter string may match instead).
+
+    Args:
+        texts (Iterable[str]): Strings to match.
+
+    Returns:
+        str: re expression that exactly matches any one of the original strings.
+    """
+    return _strings_as_exp(tuple(texts))
+
+
+def strings_as_exp2(texts: Iterable[str]) -> str:
+    """Create a re2 Regex expression that Exactly Matches Any One String
+
+    Strings that share a prefix are grouped (i.e. ab|ac becomes a(?:b|c)), trying longer strings first.
+    Grouping compares exact characters, so it assumes case-sensitive matching
+    (with IGNORECASE a shorter string may match instead).
+
+    Args:
+        texts (Iterable[str]): Strings to match.
+
+    Returns:
+        str: re2 expression that exactly matches any one of the original strings.
+    """
+    return _strings_as_exp2(tuple(texts))
+
+
+def iter_char_range(first_codepoint: int | str, last_codepoint: int | str) -> Iterable[str]:
+    """Iterate All Characters within a Range of Codepoints (Inclusive)
+
+    Args:
+        first_codepoint (int | str): Starting (first) codepoint, or the character itself.
+        last_codepoint (int | str): Ending (last) codepoint, or the character itself.
+
+    Returns:
+        Iterable[str]: Characters from within a range of codepoints.
+    """
+    return map(chr, _codepoint_range(first_codepoint, last_codepoint))
+
+
+def char_range(first_codepoint: int | str, last_codepoint: int | str) -> tuple[str, ...]:
+    """Tuple of All Characters within a Range of Codepoints (Inclusive)
+
+    Args:
+        first_codepoint (int | str): Starting (first) codepoint, or the character itself.
+        last_codepoint (int | str): Ending (last) codepoint, or the character itself.
+
+    Returns:
+        tuple[str, ...]: Characters within a range of codepoints.
+    """
+    return tuple(map(chr, _codepoint_range(first_codepoint, last_codepoint)))
+
+
+def char_range_array(first_codepoint: int | str, last_codepoint: int | str) -> "numpy.ndarray":
+    """Array of All Characters within a Range of Codepoints (Inclusive)
+
+    Requires numpy. Characters are stored in a single contiguous UCS-4 buffer instead of one object each.
+
+    Args:
+        first_codepoint (int | str): Starting (first) codepoint, or the character itself.
+        last_codepoint (int | str): Ending (last) codepoint, or the character itself.
+
+    Returns:
+        numpy.ndarray: Characters within a range of codepoints (dtype U1).
+
+    Raises:
+        ValueError: If the range includes codepoints outside of 0 to 0x10FFFF.
+    """
+    np = _import_numpy()
+    codepoints = _codepoint_range(first_codepoint, last_codepoint)
+    # Check before building the array since numpy does not validate codepoints in U1
+    if codepoints and (codepoints.start < 0 or codepoints.stop - 1 > 0x10FFFF):
+        raise ValueError("Codepoints must be between 0 and 0x10FFFF")
+
+    return np.arange(codepoints.start, codepoints.stop, dtype=np.uint32).view("U1")
+
+
+def mask_span(
+    text: str,
+    span: list[int] | tuple[int, int],
+    mask: str | None = None,
+) -> str:
+    """Slice and Mask a String using a Span
+
+    Args:
+        text (str): Text to slice.
+        span (list[int] | tuple[int, int]): Domain of index positions (x1, x2) to mask from the text.
+        mask (str, optional): Mask to insert when slicing. Defaults to None.
+
+    Returns:
+        str: Text with span replaced with the mask text.
+    """
+    # if mask is None:
+    #     mask = ""
+    #
+    # return text[: span[0]] + mask + text[span[1] :]
+    if mask is None:
+        return text[: span[0]] + text[span[1] :]
+    else:
+        return text[: span[0]] + mask + text[span[1] :]
+
+
+def mask_spans(
+    text: str,
+    spans: Iterable[list[int] | tuple[int, int]],
+    masks: Iterable[str] | None = None,
+) -> str:
+    """Slice and Mask a String using Multiple Spans
+
+    Spans may be given in any order, but must not overlap.
+
+    Args:
+        text (str): Text to slice.
+        spans (Iterable[list[int] | tuple[int, int]]): Domains of index positions (x1, x2) to mask from the text.
+        masks (Iterable[str], optional): Masks to insert when slicing. Defaults to None.
+
+    Returns:
+        str: Text with all spans replaced with the mask text.
+    """
+    # Choose the loop once instead of checking for masks on every span
+    if masks is None:
+        return _mask_spans_unmasked(text, spans)
+
+    return _mask_spans_masked(text, spans, masks)
+
+
+def mask_spans_arrays(
+    text: str,
+    starts: "Sequence[int] | numpy.ndarray",
+    ends: "Sequence[int] | numpy.ndarray",
+    masks: "Sequence[str] | numpy.ndarray | None" = None,
+) -> str:
+    """Slice and Mask a String using Separate Arrays of Span Starts and Ends
+
+    Same as mask_spans, with the spans given as parallel arrays instead of pairs.
+
+    Args:
+        text (str): Text to slice.
+        starts (Sequence[int] | numpy.ndarray): Starting index position (x1) of each span.
+        ends (Sequence[int] | numpy.ndarray): Ending index position (x2) of each span.
+        masks (Sequence[str] | numpy.ndarray, optional): Masks to insert when slicing. Defaults to None.
+
+    Returns:
+        str: Text with all spans replaced with the mask text.
+
+    Raises:
+        ValueError: If starts, ends and masks (when given) are not the same length.
+    """
+    if len(starts) != len(ends) or (masks is not None and len(masks) != len(starts)):
+        raise ValueError("Starts, ends and masks must be the same length")
+
+    if hasattr(starts, "argsort"):
+        # Let numpy reorder the arrays at once (then convert to lists in one call)
+        np = _import_numpy()
+        order = starts.argsort(kind="stable")
+        starts = starts[order].tolist()
+        ends = np.asarray(ends)[order].tolist()
+        if masks is not None:
+            masks = np.asarray(masks, dtype=object)[order].tolist()
+
+        order = range(len(order))
+    else:
+        # Order the span indices instead of sorting pairs, so each array is only indexed
+        order = sorted(range(len(starts)), key=starts.__getitem__)
+
+    parts = []
+    prev_end = 0
+    if masks is None:
+        for i in order:
+            parts.append(text[prev_end : starts[i]])
+            prev_end = ends[i]
+    else:
+        for i in order:
+            parts.append(text[prev_end : starts[i]])
+            mask = masks[i]
+            if mask is not None:
+                parts.append(mask)
+
+            prev_end = ends[i]
+
+    parts.append(text[prev_end:])
+    return "".join(parts)
+
+
+def to_utf8(text: str) -> str:
+    """Force UTF-8 Text Encoding
+
+    Args:
+        text (str): Text to encode.
+
+    Returns:
+        str: Encoded text.
+    """
+    # Only non-ASCII text can fail to encode (i.e. lone surrogates)
+    if not text.isascii():
+        # Validate without decoding, since the result would equal the original text
+        text.encode("utf-8")
+
+    return text
+
+
+# Keep the pure Python expression builders reachable when the compiled ones are used
+_py_string_as_exp = string_as_exp
+_py_string_as_exp2 = string_as_exp2
+
+# Use the compiled expression builders when the extension is available
+try:
+    from ._cyutil import string_as_exp, string_as_exp2  # noqa: F811
+except ImportError:
+    pass
+
+
+class RegexToolkit:
+    _alpha_chars: frozenset[str] = _ALPHA_CHARS
+    _digit_chars: frozenset[str] = _DIGIT_CHARS
+
+    _safe_chars: frozenset[str] = _SAFE_CHARS
+    _escapable_chars: frozenset[str] = _ESCAPABLE_CHARS
+
+    # Namespace for the module-level functions
+    iter_sort_by_len = staticmethod(iter_sort_by_len)
+    sort_by_len = staticmethod(sort_by_len)
+    ord_to_codepoint = staticmethod(ord_to_codepoint)
+    codepoint_to_ord = staticmethod(codepoint_to_ord)
+    ords_to_codepoints = staticmethod(ords_to_codepoints)
+    codepoints_to_ords = staticmethod(codepoints_to_ords)
+    char_to_codepoint = staticmethod(char_to_codepoint)
+    char_as_exp = staticmethod(char_as_exp)
+    char_as_exp2 = staticmethod(char_as_exp2)
+    string_as_exp = staticmethod(string_as_exp)
+    string_as_exp2 = staticmethod(string_as_exp2)
+    strings_as_exp = staticmethod(strings_as_exp)
+    strings_as_exp2 = staticmethod(strings_as_exp2)
+    iter_char_range = staticmethod(iter_char_range)
+    char_range = staticmethod(char_range)
+    char_range_array = staticmethod(char_range_array)
+    mask_span = staticmethod(mask_span)
+    mask_spans = staticmethod(mask_spans)
+    mask_spans_arrays = staticmethod(mask_spans_arrays)
+    to_utf8 = staticmethod(to_utf8)
@@ -4,6 +4,17 @@ import sys
 import os
 import setuptools
 
+from setuptools.command.build_ext import build_ext
+
+try:
+    from setuptools.errors import CCompilerError, ExecError, PlatformError
+except ImportError:
+    from distutils.errors import (
+        CCompilerError,
+        DistutilsExecError as ExecError,
+        DistutilsPlatformError as PlatformError,
+    )
+
 
 REQUIRED_PYTHON = (3, 9)
 CURRENT_PYTHON = sys.version_info[:2]
@@ -30,6 +41,37 @@ def _globals_from_py(filepath: str) -> dict:
     return __globals
 
 
+class OptionalBuildExt(build_ext):
+    """Build extensions when possible, otherwise fall back to pure Python"""
+
+    def run(self):
+        try:
+            super().run()
+        except (CCompilerError, ExecError, PlatformError, OSError) as e:
+            self._warn_skipped(e)
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except (CCompilerError, ExecError, PlatformError, OSError) as e:
+            self._warn_skipped(e)
+
+    @staticmethod
+    def _warn_skipped(error: Exception):
+        sys.stderr.write(f"WARNING: Skipping compiled extensions, using pure Python instead ({error})\n")
+
+
+# Build the compiled expression builders when Cython is available
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        [setuptools.Extension("regex_toolkit._cyutil", ["regex_toolkit/_cyutil.pyx"])],
+        compiler_directives={"language_level": "3"},
+    )
+
 here = os.path.abspath(os.path.dirname(__file__))
 version = _globals_from_py(os.path.join(here, "regex_toolkit", "__version__.py"))
 with open("README.md", mode="r", encoding="utf-8") as rf:
@@ -68,7 +110,10 @@ setuptools.setup(
     packages=["regex_toolkit"],
     package_data={
         "": ["LICENSE", "NOTICE"],
+        "regex_toolkit": ["_cyutil.pyx"],
     },
+    ext_modules=ext_modules,
+    cmdclass={"build_ext": OptionalBuildExt},
     package_dir={"regex_toolkit": "regex_toolkit"},
     include_package_data=True,
     python_requires=">=3.9, <4",
@@ -94,7 +139,9 @@ setuptools.setup(
         "Topic :: Software Development :: Libraries",
         "Topic :: Software Development :: Libraries :: Python Modules",
     ],
-    extras_require={},
+    extras_require={
+        "numpy": ["numpy"],
+    },
     entry_points={},
     keywords=["re", "re2", "expression", "regex", "toolkit", "regex-toolkit"],
     project_urls={
@@ -1,10 +1,22 @@
 #!/usr/bin/python3
 
+import re
 import unittest
 
 from collections.abc import Iterable
 from itertools import product
 from regex_toolkit import RegexToolkit as rtk
+from regex_toolkit import base
+
+try:
+    from regex_toolkit import _cyutil
+except ImportError:
+    _cyutil = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class TestStringMethods(unittest.TestCase):
@@ -132,6 +144,92 @@ class TestStringMethods(unittest.TestCase):
 
                 prev_len = len(text)
 
+    def test_ord_to_codepoint(self):
+        for ordinal, expected_codepoint in (
+            (0, "00000000"),
+            (ord("a"), "00000061"),
+            (ord("🅰"), "0001f170"),
+            (0x10FFFF, "0010ffff"),
+        ):
+            actual_codepoint = rtk.ord_to_codepoint(ordinal)
+            self.assertEqual(actual_codepoint, expected_codepoint)
+
+            actual_codepoint = rtk.char_to_codepoint(chr(ordinal))
+            self.assertEqual(actual_codepoint, expected_codepoint)
+
+    def test_codepoint_to_ord(self):
+        for codepoint, expected_ordinal in (
+            ("00000000", 0),
+            ("00000061", ord("a")),
+            ("0001f170", ord("🅰")),
+            ("0001F170", ord("🅰")),
+            ("0010ffff", 0x10FFFF),
+        ):
+            actual_ordinal = rtk.codepoint_to_ord(codepoint)
+            self.assertEqual(actual_ordinal, expected_ordinal)
+
+        # Round trip
+        for ordinal in (0, 0x7F, 0xFFFF, 0x1F170, 0x10FFFF):
+            self.assertEqual(rtk.codepoint_to_ord(rtk.ord_to_codepoint(ordinal)), ordinal)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_ords_to_codepoints(self):
+        ordinals = [0, ord("a"), ord("🅰"), 0x10FFFF]
+        result = rtk.ords_to_codepoints(ordinals)
+
+        # Returns a array of codepoints
+        self.assertIsInstance(result, numpy.ndarray)
+        self.assertEqual(result.dtype, numpy.dtype("S8"))
+
+        # Validate output against the scalar function
+        actual_codepoints = [codepoint.decode("ascii") for codepoint in result.tolist()]
+        expected_codepoints = list(map(rtk.ord_to_codepoint, ordinals))
+        self.assertEqual(actual_codepoints, expected_codepoints)
+
+        # Ordinals must fit in 8 hex digits
+        for ordinal in (-1, 2**32, 2**32 + 5, 2**64):
+            with self.assertRaises(ValueError):
+                rtk.ords_to_codepoints([0, ordinal])
+
+        for ordinal in (-1, 2**32 + 5):
+            with self.assertRaises(ValueError):
+                rtk.ords_to_codepoints(numpy.array([0, ordinal], dtype=numpy.int64))
+
+        # Ordinals must be integers
+        for ordinal in (float("nan"), 1.5, 97.99, 97.0, "a"):
+            with self.assertRaises(ValueError):
+                rtk.ords_to_codepoints([0, ordinal])
+        with self.assertRaises(ValueError):
+            rtk.ords_to_codepoints(numpy.array([97.0, 98.0]))
+
+        # Integer and bool arrays are accepted
+        actual_codepoints = rtk.ords_to_codepoints(numpy.array([True, False])).tolist()
+        self.assertEqual(actual_codepoints, [b"00000001", b"00000000"])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_codepoints_to_ords(self):
+        codepoints = ["00000000", "00000061", "0001f170", "0001F170", "0010ffff"]
+        result = rtk.codepoints_to_ords(codepoints)
+
+        # Returns a array of ordinals
+        self.assertIsInstance(result, numpy.ndarray)
+        self.assertEqual(result.dtype, numpy.dtype("uint32"))
+
+        # Validate output against the scalar function
+        actual_ordinals = result.tolist()
+        expected_ordinals = list(map(rtk.codepoint_to_ord, codepoints))
+        self.assertEqual(actual_ordinals, expected_ordinals)
+
+        # Round trip
+        ordinals = numpy.arange(0, 0x110000, 0x101, dtype=numpy.uint32)
+        actual_ordinals = rtk.codepoints_to_ords(rtk.ords_to_codepoints(ordinals))
+        self.assertTrue((actual_ordinals == ordinals).all())
+
+        # Codepoints must be 8 hex digits
+        for codepoint in ("1f170", "0001f17g", "000000001", "0001f1700"):
+            with self.assertRaises(ValueError):
+                rtk.codepoints_to_ords([codepoint])
+
     def test_string_as_exp_safe_chars(self):
         text = "".join(rtk._safe_chars)
         actual_exp = rtk.string_as_exp(text)
@@ -156,6 +254,31 @@ class TestStringMethods(unittest.TestCase):
         expected_exp = "\\" + "\\".join(rtk._escapable_chars)
         self.assertEqual(actual_exp, expected_exp)
 
+    def test_string_as_exp_matches_text(self):
+        # Every character (except surrogates) escaped together matches only itself
+        text = "".join(char for char in map(chr, range(0x3000)) if not 0xD800 <= ord(char) <= 0xDFFF)
+        for try_text in (text, text + "🅰🅱🅲"):
+            pattern = re.compile(rtk.string_as_exp(try_text))
+            self.assertIsNotNone(pattern.fullmatch(try_text))
+            self.assertIsNone(pattern.fullmatch(try_text[1:]))
+
+    @unittest.skipIf(_cyutil is None, "compiled extension is not built")
+    def test_compiled_string_as_exp(self):
+        # Compiled expression builders match the pure Python versions
+        texts = (
+            "",
+            "Hello World 123",
+            "".join(map(chr, range(128))),
+            "a.b*c+d?e(f)g[h]i{j}k|l^m$n\\o",
+            "\x00\x01\x07\x1b\x7f\t\n\r",
+            "\ud800\udc00\udfff",
+            "🅰🅱🅲 \U0010ffff 𝔘",
+            "ascii and ü and 🅰",
+        )
+        for text in texts:
+            self.assertEqual(_cyutil.string_as_exp(text), base._py_string_as_exp(text))
+            self.assertEqual(_cyutil.string_as_exp2(text), base._py_string_as_exp2(text))
+
     def test_iter_char_range(self):
         result = rtk.iter_char_range("a", "z")
 
@@ -178,6 +301,40 @@ class TestStringMethods(unittest.TestCase):
         excpected_char_range = tuple("abcdefghijklmnopqrstuvwxyz")
         self.assertEqual(actual_char_range, excpected_char_range)
 
+        # Accepts ordinals as well as characters
+        for first_codepoint, last_codepoint in (
+            (ord("a"), ord("z")),
+            ("a", ord("z")),
+            (ord("a"), "z"),
+        ):
+            actual_char_range = rtk.char_range(first_codepoint, last_codepoint)
+            self.assertEqual(actual_char_range, excpected_char_range)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_char_range_array(self):
+        result = rtk.char_range_array("a", "z")
+
+        # Returns a array of single characters
+        self.assertIsInstance(result, numpy.ndarray)
+        self.assertEqual(result.dtype, numpy.dtype("U1"))
+
+        # Validate output
+        actual_char_range = tuple(result.tolist())
+        excpected_char_range = tuple("abcdefghijklmnopqrstuvwxyz")
+        self.assertEqual(actual_char_range, excpected_char_range)
+
+        actual_char_range = tuple(rtk.char_range_array(0x1F170, 0x1F172).tolist())
+        self.assertEqual(actual_char_range, ("🅰", "🅱", "🅲"))
+
+        # Codepoints must be valid (same as char_range)
+        actual_char_range = tuple(rtk.char_range_array(0x10FFFE, 0x10FFFF).tolist())
+        self.assertEqual(actual_char_range, rtk.char_range(0x10FFFE, 0x10FFFF))
+        for first_codepoint, last_codepoint in ((0x10FFFF, 0x110000), (-1, 0x61)):
+            with self.assertRaises(ValueError):
+                rtk.char_range(first_codepoint, last_codepoint)
+            with self.assertRaises(ValueError):
+                rtk.char_range_array(first_codepoint, last_codepoint)
+
     def test_mask_span(self):
         text = "This is an example"
 
@@ -201,6 +358,86 @@ class TestStringMethods(unittest.TestCase):
             expected_text = "This isn't an example"
             self.assertEqual(actual_text, expected_text)
 
+    def test_mask_spans(self):
+        text = "This is an example"
+
+        # Run test using different acceptable sequence types
+        spans = ((9, 10), (11, 18))
+        for try_type, spans_as_try_type in {
+            tuple: spans,
+            list: list(map(list, spans)),
+            Iterable: iter(spans),
+        }.items():
+            actual_text = rtk.mask_spans(text, spans_as_try_type, [" good", "sample"])
+            expected_text = "This is a good sample"
+            self.assertEqual(actual_text, expected_text)
+
+        # Without masks
+        actual_text = rtk.mask_spans(text, [(4, 7), (10, 18)])
+        expected_text = "This an"
+        self.assertEqual(actual_text, expected_text)
+
+        # Spans in any order, with masks kept with their spans
+        actual_text = rtk.mask_spans(text, [(11, 18), (9, 10)], iter(["sample", " good"]))
+        expected_text = "This is a good sample"
+        self.assertEqual(actual_text, expected_text)
+
+        actual_text = rtk.mask_spans(text, [(10, 18), (4, 7)])
+        expected_text = "This an"
+        self.assertEqual(actual_text, expected_text)
+
+        # Without spans
+        actual_text = rtk.mask_spans(text, [])
+        self.assertEqual(actual_text, text)
+
+    def test_mask_spans_arrays(self):
+        text = "This is an example"
+
+        # Run test using different acceptable sequence types
+        starts, ends = (11, 9), (18, 10)
+        for try_type, (starts_as_try_type, ends_as_try_type) in {
+            tuple: (starts, ends),
+            list: (list(starts), list(ends)),
+        }.items():
+            actual_text = rtk.mask_spans_arrays(text, starts_as_try_type, ends_as_try_type, ["sample", " good"])
+            expected_text = "This is a good sample"
+            self.assertEqual(actual_text, expected_text)
+
+        # Without masks
+        actual_text = rtk.mask_spans_arrays(text, [4, 10], [7, 18])
+        expected_text = "This an"
+        self.assertEqual(actual_text, expected_text)
+
+        # Starts, ends and masks must be the same length
+        for starts, ends, masks in (
+            ([4, 10], [7], None),
+            ([4, 10], [7, 18], ["X"]),
+            ([4, 10], [7, 18], ["X", "Y", "Z"]),
+        ):
+            with self.assertRaises(ValueError):
+                rtk.mask_spans_arrays(text, starts, ends, masks)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_mask_spans_arrays_numpy(self):
+        text = "This is an example"
+        starts = numpy.array([9, 11], dtype=numpy.int64)
+        ends = numpy.array([10, 18], dtype=numpy.int64)
+        masks = numpy.array([" good", "sample"])
+        actual_text = rtk.mask_spans_arrays(text, starts, ends, masks)
+        expected_text = "This is a good sample"
+        self.assertEqual(actual_text, expected_text)
+
+        # Spans in any order, with masks as a list
+        actual_text = rtk.mask_spans_arrays(text, starts[::-1], ends[::-1], ["sample", None])
+        expected_text = "This is a sample"
+        self.assertEqual(actual_text, expected_text)
+
+        # Starts, ends and masks must be the same length
+        with self.assertRaises(ValueError):
+            rtk.mask_spans_arrays(text, starts, ends[:1])
+        with self.assertRaises(ValueError):
+            rtk.mask_spans_arrays(text, starts, ends, masks[:1])
+
     def test_char_as_exp(self):
         for char, expected_exp in (
             ("s", "s"),
@@ -273,6 +510,47 @@ class TestStringMethods(unittest.TestCase):
             actual_exp = rtk.strings_as_exp(texts)
             self.assertEqual(actual_exp, expected_exp)
 
+        # Repeated calls follow the order of the given strings
+        for texts, expected_exp in [
+            (["a", "b"], "a|b"),
+            (["b", "a"], "b|a"),
+            (["a", "b"], "a|b"),
+        ]:
+            actual_exp = rtk.strings_as_exp(texts)
+            self.assertEqual(actual_exp, expected_exp)
+
+        # Shared prefixes are grouped (longest first)
+        for texts, expected_exp in [
+            (["ab", "ac", "ade"], "a(?:de|b|c)"),
+            (["abc", "ab", "abd"], "ab(?:c|d)?"),
+            (["a", "ab", "abcd"], "a(?:b(?:cd)?)?"),
+            (["bad.word", "bad.words", "bad-word"], "bad(?:\\.word(?:s)?|\\-word)"),
+            (["🅰lpha", "🅰lphabet"], "\\🅰lpha(?:bet)?"),
+            (["alpha", ""], "alpha|"),
+            ([""], ""),
+            ([], ""),
+        ]:
+            actual_exp = rtk.strings_as_exp(texts)
+            self.assertEqual(actual_exp, expected_exp)
+
+        # Grouped expression matches each string exactly, preferring the longest
+        texts = ["bad", "bad.word", "bad.words", "bad-word", "good"]
+        pattern = re.compile(rtk.strings_as_exp(texts))
+        for text in texts:
+            self.assertIsNotNone(pattern.fullmatch(text))
+
+        actual_matches = pattern.findall("bad.words bad.wordy badly good")
+        expected_matches = ["bad.words", "bad.word", "bad", "good"]
+        self.assertEqual(actual_matches, expected_matches)
+
+        # Grouping is by exact characters (case-sensitive matching)
+        texts = ["xa", "Xab", "xabc"]
+        actual_exp = rtk.strings_as_exp(texts)
+        expected_exp = "xa(?:bc)?|Xab"
+        self.assertEqual(actual_exp, expected_exp)
+        for text in texts:
+            self.assertEqual(re.match(actual_exp, text).group(), text)
+
     def test_strings_as_exp2(self):
         # Alphanumeric single char and multi-char combos
         for i in range(4):
@@ -318,3 +596,35 @@ class TestStringMethods(unittest.TestCase):
         ]:
             actual_exp = rtk.strings_as_exp2(texts)
             self.assertEqual(actual_exp, expected_exp)
+
+        # Repeated calls follow the order of the given strings
+        for texts, expected_exp in [
+            (["a", "b"], "a|b"),
+            (["b", "a"], "b|a"),
+            (["a", "b"], "a|b"),
+        ]:
+            actual_exp = rtk.strings_as_exp2(texts)
+            self.assertEqual(actual_exp, expected_exp)
+
+        # Shared prefixes are grouped (longest first)
+        for texts, expected_exp in [
+            (["ab", "ac", "ade"], "a(?:de|b|c)"),
+            (["abc", "ab", "abd"], "ab(?:c|d)?"),
+            (["a", "ab", "abcd"], "a(?:b(?:cd)?)?"),
+            (["bad.word", "bad.words", "bad-word"], "bad(?:\\.word(?:s)?|\\-word)"),
+            (["🅰lpha", "🅰lphabet"], "\\x{0001f170}lpha(?:bet)?"),
+            (["alpha", ""], "alpha|"),
+            ([""], ""),
+            ([], ""),
+        ]:
+            actual_exp = rtk.strings_as_exp2(texts)
+            self.assertEqual(actual_exp, expected_exp)
+
+    def test_to_utf8(self):
+        for text in ("", "alpha", "🅰lpha", "\u00e9\n\u4e2d"):
+            actual_text = rtk.to_utf8(text)
+            self.assertEqual(actual_text, text)
+
+        # Lone surrogates cannot be encoded
+        with self.assertRaises(UnicodeEncodeError):
+            rtk.to_utf8("alpha\ud800")